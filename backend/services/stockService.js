@@ -16,6 +16,11 @@ class StockService {
 
     // Check if API keys are properly set
     this.hasValidKeys = this.checkApiKeys();
+
+    // Company profiles (name, sector, market cap) change slowly - cache them
+    // for hours so the 5-minute quote refresh skips the profile round-trip
+    this.profileCache = new Map();
+    this.profileCacheTtlMs = 6 * 60 * 60 * 1000;
   }
 
   checkApiKeys() {
@@ -100,6 +105,12 @@ class StockService {
   // Get company profile
   async getCompanyProfile(symbol) {
     try {
+      // Serve from the long-lived profile cache when fresh
+      const cached = this.profileCache.get(symbol.toUpperCase());
+      if (cached && Date.now() - cached.fetchedAt < this.profileCacheTtlMs) {
+        return cached.profile;
+      }
+
       // If no valid API key, return basic mock profile
       if (!this.finnhubKey || this.finnhubKey === 'demo') {
         logger.info(`Using mock profile for ${symbol} - demo API key detected`);
@@ -120,6 +131,11 @@ class StockService {
         timeout: 3000 // Reduced timeout for faster fallback
       });
 
+      this.profileCache.set(symbol.toUpperCase(), {
+        profile: response.data,
+        fetchedAt: Date.now()
+      });
+
       return response.data;
     } catch (error) {
       if (this.finnhubKey === 'demo') {
@@ -166,19 +182,21 @@ class StockService {
         throw new Error('No historical data available');
       }
 
-      const historicalData = [];
-      for (const [date, values] of Object.entries(timeSeries)) {
-        historicalData.push({
-          date: new Date(date),
-          open: parseFloat(values['1. open']),
-          high: parseFloat(values['2. high']),
-          low: parseFloat(values['3. low']),
-          close: parseFloat(values['4. close']),
-          volume: parseInt(values['5. volume'])
+      // Alpha Vantage keys are 'YYYY-MM-DD', so sorting the strings orders
+      // the rows chronologically without allocating Dates in the comparator
+      return Object.keys(timeSeries)
+        .sort()
+        .map(date => {
+          const values = timeSeries[date];
+          return {
+            date: new Date(date),
+            open: parseFloat(values['1. open']),
+            high: parseFloat(values['2. high']),
+            low: parseFloat(values['3. low']),
+            close: parseFloat(values['4. close']),
+            volume: parseInt(values['5. volume'])
+          };
         });
-      }
-
-      return historicalData.sort((a, b) => new Date(a.date) - new Date(b.date));
     } catch (error) {
       if (this.alphaVantageKey === 'demo') {
         logger.info(`Using mock historical data for ${symbol} - demo API key cannot access real data`);
@@ -244,11 +262,12 @@ class StockService {
   // Update or create stock in database
   async updateStockData(symbol) {
     try {
-      // Get real-time data
-      const realTimeData = await this.getRealTimeData(symbol);
-      
-      // Get company profile
-      const profile = await this.getCompanyProfile(symbol);
+      // Quote and profile come from independent endpoints - fetch them in
+      // parallel instead of paying two sequential round-trips
+      const [realTimeData, profile] = await Promise.all([
+        this.getRealTimeData(symbol),
+        this.getCompanyProfile(symbol)
+      ]);
 
       const stockData = {
         symbol: symbol.toUpperCase(),
@@ -349,19 +368,23 @@ class StockService {
     }
   }
 
-  // Get multiple stocks
+  // Get multiple stocks (fetched concurrently - one slow symbol no longer
+  // delays the rest, so total latency is the slowest fetch, not the sum)
   async getMultipleStocks(symbols) {
     const results = [];
     const errors = [];
 
-    for (const symbol of symbols) {
-      try {
-        const stock = await this.getStock(symbol);
-        results.push(stock);
-      } catch (error) {
-        errors.push({ symbol, error: error.message });
+    const settled = await Promise.allSettled(
+      symbols.map(symbol => this.getStock(symbol))
+    );
+
+    settled.forEach((outcome, index) => {
+      if (outcome.status === 'fulfilled') {
+        results.push(outcome.value);
+      } else {
+        errors.push({ symbol: symbols[index], error: outcome.reason.message });
       }
-    }
+    });
 
     return { stocks: results, errors };
   }
@@ -1,5 +1,6 @@
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import yfinance as yf
 import pandas as pd
 import numpy as np
@@ -8,7 +9,7 @@ from typing import Optional, List
 import logging
 import warnings
 from services.prediction_service import PredictionService
-from models.prediction_models import PredictionResponse, HealthResponse
+from models.prediction_models import PredictionResponse, BatchPredictionResponse, HealthResponse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,7 +21,8 @@ warnings.filterwarnings('ignore')
 app = FastAPI(
     title="Stock Prediction Service",
     description="Auto-regression based stock price prediction service",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -35,19 +37,55 @@ app.add_middleware(
 # Initialize prediction service
 prediction_service = PredictionService()
 
+# Static payloads built once at startup - the handlers below serve constant
+# data, so there is no need to rebuild the dicts on every request
+_SERVICE_INFO = {
+    "service": "Stock Prediction Service",
+    "version": "1.0.0",
+    "description": "Auto-regression based stock price prediction",
+    "endpoints": {
+        "predict": "/predict/{symbol}",
+        "predict_batch": "/predict?symbols=AAPL,MSFT",
+        "health": "/health",
+        "docs": "/docs"
+    }
+}
+
+_MODELS_INFO = {
+    "available_models": [
+        {
+            "name": "AutoRegression",
+            "description": "Time series autoregression using statsmodels",
+            "optimal_for": "Short to medium term predictions"
+        },
+        {
+            "name": "Linear Regression",
+            "description": "Linear regression with technical indicators",
+            "optimal_for": "Trend-based predictions"
+        },
+        {
+            "name": "ARIMA",
+            "description": "AutoRegressive Integrated Moving Average",
+            "optimal_for": "Time series with trends and seasonality"
+        }
+    ],
+    "ensemble_method": "Average of all models",
+    "confidence_interval": "95% confidence bounds"
+}
+
+_SUPPORTED_SYMBOLS = {
+    "popular_symbols": [
+        'AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA',
+        'META', 'NVDA', 'NFLX', 'AMD', 'PYPL',
+        'SPY', 'QQQ', 'IWM', 'DIA', 'VOO'
+    ],
+    "note": "Service supports any valid stock symbol available on Yahoo Finance"
+}
+
 @app.get("/", response_model=dict)
 async def root():
     """Root endpoint with service information"""
-    return {
-        "service": "Stock Prediction Service",
-        "version": "1.0.0",
-        "description": "Auto-regression based stock price prediction",
-        "endpoints": {
-            "predict": "/predict/{symbol}",
-            "health": "/health",
-            "docs": "/docs"
-        }
-    }
+    return _SERVICE_INFO
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
@@ -59,6 +97,40 @@ async def health_check():
         version="1.0.0"
     )
 
+@app.get("/predict", response_model=BatchPredictionResponse)
+async def predict_batch(
+    symbols: str = Query(..., description="Comma-separated stock symbols (e.g. AAPL,MSFT)"),
+    days: int = Query(default=30, ge=1, le=365, description="Number of days to predict")
+):
+    """
+    Predict stock prices for several symbols in one request
+
+    Args:
+        symbols: Comma-separated stock symbols (e.g. AAPL,MSFT,GOOGL)
+        days: Number of days to predict (1-365)
+
+    Returns:
+        Predictions keyed by symbol, with per-symbol errors reported separately
+    """
+    symbol_list = [s.strip().upper() for s in symbols.split(',') if s.strip()]
+    if not symbol_list:
+        raise HTTPException(status_code=400, detail="No symbols provided")
+
+    try:
+        logger.info(f"Generating batch predictions for {len(symbol_list)} symbols for {days} days")
+
+        results, errors = await prediction_service.predict_batch(symbol_list, days)
+
+        return BatchPredictionResponse(
+            results=results,
+            errors=errors,
+            timestamp=datetime.now()
+        )
+
+    except Exception as e:
+        logger.error(f"Error predicting batch {symbols}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+
 @app.get("/predict/{symbol}", response_model=PredictionResponse)
 async def predict_stock_price(
     symbol: str,
@@ -92,41 +164,12 @@ async def predict_stock_price(
 @app.get("/models/info")
 async def get_model_info():
     """Get information about available prediction models"""
-    return {
-        "available_models": [
-            {
-                "name": "AutoRegression",
-                "description": "Time series autoregression using statsmodels",
-                "optimal_for": "Short to medium term predictions"
-            },
-            {
-                "name": "Linear Regression",
-                "description": "Linear regression with technical indicators",
-                "optimal_for": "Trend-based predictions"
-            },
-            {
-                "name": "ARIMA",
-                "description": "AutoRegressive Integrated Moving Average",
-                "optimal_for": "Time series with trends and seasonality"
-            }
-        ],
-        "ensemble_method": "Average of all models",
-        "confidence_interval": "95% confidence bounds"
-    }
+    return _MODELS_INFO
 
 @app.get("/supported-symbols")
 async def get_supported_symbols():
     """Get list of supported stock symbols"""
-    popular_symbols = [
-        'AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA', 
-        'META', 'NVDA', 'NFLX', 'AMD', 'PYPL',
-        'SPY', 'QQQ', 'IWM', 'DIA', 'VOO'
-    ]
-    
-    return {
-        "popular_symbols": popular_symbols,
-        "note": "Service supports any valid stock symbol available on Yahoo Finance"
-    }
+    return _SUPPORTED_SYMBOLS
 
 if __name__ == "__main__":
     import uvicorn
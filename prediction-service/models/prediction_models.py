@@ -28,6 +28,11 @@ class PredictionResponse(BaseModel):
     model_info: ModelInfo = Field(..., description="Information about the prediction models")
     timestamp: datetime = Field(..., description="Timestamp when prediction was generated")
 
+class BatchPredictionResponse(BaseModel):
+    results: Dict[str, PredictionResponse] = Field(..., description="Successful predictions keyed by symbol")
+    errors: Dict[str, str] = Field(..., description="Error messages for symbols that failed")
+    timestamp: datetime = Field(..., description="Timestamp when the batch was generated")
+
 class HealthResponse(BaseModel):
     status: str = Field(..., description="Service health status")
     timestamp: datetime = Field(..., description="Health check timestamp")
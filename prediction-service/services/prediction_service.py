@@ -1,79 +1,246 @@
 import pandas as pd
 import numpy as np
 import yfinance as yf
-from datetime import datetime, timedelta
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.linear_model import LinearRegression
-from statsmodels.tsa.ar_model import AutoReg
-from statsmodels.tsa.arima.model import ARIMA
+from datetime import datetime
+from cachetools import TTLCache
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from threading import Lock
 import asyncio
 import logging
+import time
+import requests
+from requests.adapters import HTTPAdapter
 from models.prediction_models import PredictionResponse, PredictionData, ModelInfo, AccuracyMetrics
 
 logger = logging.getLogger(__name__)
 
+# Cache history downloads so repeated requests for the same symbol within the
+# TTL window skip the network round-trip and DataFrame parsing entirely.
+# Only the closes and dates are stored (not whole DataFrames), and per-symbol
+# asyncio locks coalesce concurrent misses into a single download
+_HISTORY_TTL = 3600
+_HISTORY_MAXSIZE = 256
+_history_cache = {}   # symbol -> (fetched_at, prices, dates)
+_history_locks = {}   # symbol -> asyncio.Lock
+_history_locks_guard = Lock()
+
+# Cache fitted models so repeat requests for a symbol skip the expensive
+# statsmodels fit (the dominant per-request cost) and only re-run the
+# forecast. Entries are fingerprinted on the underlying series, so a stale
+# fit can never be served against new data - the TTL only bounds memory for
+# symbols that stop being queried, and a day is enough since daily bars
+# change the fingerprint at most once per session
+_fit_cache = TTLCache(maxsize=64, ttl=86400)
+_fit_cache_lock = Lock()
+
+# AR lag order. The 2y histories the service fetches (~500 points) always
+# saturated the old min(20, len // 5) computation, and the 50-point minimum
+# enforced before fitting keeps a 20-lag model well-posed even at the floor
+_AR_MAX_LAG = 20
+
+# Dedicated pool for model fits, shared across requests - one worker per
+# ensemble method. The fits are CPU-bound, so worker processes run them
+# truly in parallel instead of serializing behind the GIL; forkserver keeps
+# workers from inheriting the parent's full state
+_fit_pool = ProcessPoolExecutor(max_workers=3, mp_context=get_context("forkserver"))
+
+# Share one pooled HTTP session across yfinance calls so fetches reuse
+# kept-alive connections instead of paying a TCP+TLS handshake each time
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=50))
+
+def _fetch_history(symbol, period="2y"):
+    """Fetch price history from Yahoo Finance"""
+    return yf.Ticker(symbol, session=_session).history(period=period)
+
+def _fast_ma(x, w):
+    """O(n) moving average via cumulative sums (single pass, no windows)"""
+    c = np.concatenate(([0.0], np.cumsum(x)))
+    return (c[w:] - c[:-w]) / w
+
+# The fit functions live at module level so the process pool can pickle
+# references to them; they run inside the worker processes.
+
+def _fit_ar(prices):
+    """Fit an AutoRegression model"""
+    # Imported lazily so workers only pay the statsmodels import cost on
+    # the first fit, not at boot
+    from statsmodels.tsa.ar_model import AutoReg
+
+    model = AutoReg(prices, lags=_AR_MAX_LAG, trend='ct')
+    return model.fit()
+
+def _fit_arima(prices):
+    """Fit a simple ARIMA(1,1,1) model via the statespace representation"""
+    # Imported lazily, as in _fit_ar, to keep cold-start fast
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    # Going through SARIMAX directly skips the ARIMA wrapper layer, and
+    # concentrating the scale out of the likelihood leaves the optimizer
+    # one fewer parameter to estimate
+    model = SARIMAX(prices, order=(1, 1, 1), concentrate_scale=True)
+    return model.fit(disp=0)
+
+def _fit_lr(prices):
+    """Fit a linear regression on moving-average features"""
+    # Imported lazily like the statsmodels fits, so neither the parent nor
+    # the fit workers pay the sklearn import before the first prediction
+    from sklearn.linear_model import LinearRegression
+
+    # Create features: moving averages computed directly on the NumPy
+    # array with a single cumulative-sum pass per window
+    prices_arr = np.asarray(prices, dtype=np.float64)
+    ma_5 = _fast_ma(prices_arr, 5)
+    ma_10 = _fast_ma(prices_arr, 10)
+    ma_20 = _fast_ma(prices_arr, 20)
+
+    # Align all features to the shortest (20-day) window
+    n = len(ma_20)
+    trend = np.arange(len(prices_arr) - n, len(prices_arr))
+    X = np.column_stack([ma_5[-n:], ma_10[-n:], ma_20[-n:], trend])
+    y = prices_arr[-n:]
+
+    # Train model; only the coefficients are needed for forecasting
+    model = LinearRegression()
+    model.fit(X, y)
+    return model.coef_.astype(np.float64), float(model.intercept_)
+
+def _lr_forecast(coef, intercept, window, n_hist, days):
+    """Roll a fitted linear model forward over a 20-price ring buffer"""
+    out = np.empty(days)
+    ring = np.empty(20)
+    ring[:] = window
+    head = 0  # Index of the oldest price in the ring
+    sum_5 = ring[-5:].sum()
+    sum_10 = ring[-10:].sum()
+    sum_20 = ring.sum()
+
+    for i in range(days):
+        pred = (intercept
+                + coef[0] * (sum_5 / 5.0)
+                + coef[1] * (sum_10 / 10.0)
+                + coef[2] * (sum_20 / 20.0)
+                + coef[3] * (n_hist + i))
+        out[i] = pred
+
+        # Appending pred pushes the oldest element out of each window
+        sum_5 += pred - ring[(head + 15) % 20]
+        sum_10 += pred - ring[(head + 10) % 20]
+        sum_20 += pred - ring[head]
+        ring[head] = pred
+        head = (head + 1) % 20
+
+    return out
+
 class PredictionService:
-    def __init__(self):
-        self.scaler = MinMaxScaler()
-    
+    async def _get_history(self, symbol):
+        """Return (close prices, date index) for a symbol, cached with a TTL"""
+        now = time.monotonic()
+        entry = _history_cache.get(symbol)
+        if entry and now - entry[0] < _HISTORY_TTL:
+            return entry[1], entry[2]
+
+        with _history_locks_guard:
+            lock = _history_locks.setdefault(symbol, asyncio.Lock())
+
+        async with lock:
+            # Double-check: another request may have fetched while we waited
+            entry = _history_cache.get(symbol)
+            if entry and time.monotonic() - entry[0] < _HISTORY_TTL:
+                return entry[1], entry[2]
+
+            # Run the blocking network fetch in a thread so the event loop
+            # stays free to serve other requests
+            loop = asyncio.get_event_loop()
+            hist = await loop.run_in_executor(None, _fetch_history, symbol)
+
+            # float32 is plenty for prices rounded to cents in the response,
+            # and halves the bytes every downstream reduction and moving
+            # average streams through; contiguity keeps slices as flat views
+            prices = np.ascontiguousarray(hist['Close'].to_numpy(), dtype=np.float32)
+            dates = hist.index
+
+            # Keep the cache bounded: drop expired entries first, then the
+            # oldest if every entry is still fresh
+            if len(_history_cache) >= _HISTORY_MAXSIZE:
+                cutoff = time.monotonic() - _HISTORY_TTL
+                for stale in [s for s, e in _history_cache.items() if e[0] < cutoff]:
+                    del _history_cache[stale]
+                if len(_history_cache) >= _HISTORY_MAXSIZE:
+                    oldest = min(_history_cache, key=lambda s: _history_cache[s][0])
+                    del _history_cache[oldest]
+
+            _history_cache[symbol] = (time.monotonic(), prices, dates)
+            return prices, dates
+
     async def predict_prices(self, symbol: str, days: int = 30) -> PredictionResponse:
         """Predict future stock prices using auto-regression ensemble"""
         try:
             # Get historical data (2 years for better model training)
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="2y")
-            
-            if len(hist) < 50:  # Need minimum data for prediction
+            prices, dates = await self._get_history(symbol)
+
+            if len(prices) < 50:  # Need minimum data for prediction
                 raise ValueError(f"Insufficient historical data for {symbol}")
-            
-            # Prepare data
-            prices = hist['Close'].values
+
+            # Daily returns feed the confidence intervals; compute the pass
+            # over the series once per request, dividing in place so the
+            # diff output is the only temporary allocated
+            returns = np.diff(prices)
+            returns /= prices[:-1]
+            volatility = float(returns.std())
             
             # Run prediction methods asynchronously
             tasks = [
-                self._predict_with_autoregression(prices, days),
-                self._predict_with_linear_regression(prices, days),
-                self._predict_with_arima(prices, days)
+                self._predict_with_autoregression(symbol, prices, days),
+                self._predict_with_linear_regression(symbol, prices, days),
+                self._predict_with_arima(symbol, prices, days)
             ]
             
             ar_predictions, lr_predictions, arima_predictions = await asyncio.gather(*tasks)
             
-            # Ensemble prediction (average of methods)
-            ensemble_predictions = []
-            for i in range(days):
-                ensemble_pred = np.mean([
-                    ar_predictions[i],
-                    lr_predictions[i],
-                    arima_predictions[i]
-                ])
-                ensemble_predictions.append(ensemble_pred)
-            
-            # Calculate confidence intervals
-            confidence_intervals = self._calculate_confidence_intervals(
-                prices, ensemble_predictions
-            )
+            # Ensemble prediction (average of methods), computed as one
+            # axis-0 reduction over the stacked forecasts
+            ensemble_predictions = np.vstack([
+                np.asarray(ar_predictions),
+                np.asarray(lr_predictions),
+                np.asarray(arima_predictions)
+            ]).mean(axis=0)
             
-            # Generate future dates (business days only)
-            future_dates = self._generate_business_dates(hist.index[-1], days)
-            
-            # Prepare response
+            # Generate future dates (business days only), formatted in one
+            # vectorized strftime pass over the whole index
+            future_dates = self._generate_business_dates(dates[-1], days)
+            date_strs = future_dates.strftime('%Y-%m-%d')
+
+            # Prepare response: confidence bounds, change and change-percent
+            # are fused into one vectorized block over the ensemble array
             current_price = float(prices[-1])
-            predictions_data = []
-            
-            for i, date in enumerate(future_dates[:days]):
-                if i < len(ensemble_predictions):
-                    pred_price = round(float(ensemble_predictions[i]), 2)
-                    lower_bound = round(float(confidence_intervals[i][0]), 2)
-                    upper_bound = round(float(confidence_intervals[i][1]), 2)
-                    
-                    predictions_data.append(PredictionData(
-                        date=date.strftime('%Y-%m-%d'),
-                        predicted_price=pred_price,
-                        lower_bound=lower_bound,
-                        upper_bound=upper_bound,
-                        change_from_current=round(pred_price - current_price, 2),
-                        change_percent=round(((pred_price - current_price) / current_price) * 100, 2)
-                    ))
+            ensemble_arr = np.asarray(ensemble_predictions, dtype=np.float64)[:days]
+
+            # Uncertainty grows with the horizon; 1.96 sigma gives 95% bounds
+            uncertainty = volatility * np.sqrt(np.arange(1, len(ensemble_arr) + 1)) * ensemble_arr * 0.1  # Scale factor
+            pred_prices = np.round(ensemble_arr, 2)
+            lower_bounds = np.round(ensemble_arr - 1.96 * uncertainty, 2)
+            upper_bounds = np.round(ensemble_arr + 1.96 * uncertainty, 2)
+            changes = np.round(pred_prices - current_price, 2)
+            change_percents = np.round((pred_prices - current_price) / current_price * 100, 2)
+
+            # model_construct skips re-validation; every field is already a
+            # native str/float at this point
+            predictions_data = [
+                PredictionData.model_construct(
+                    date=date,
+                    predicted_price=pred_price,
+                    lower_bound=lower_bound,
+                    upper_bound=upper_bound,
+                    change_from_current=change,
+                    change_percent=change_percent
+                )
+                for date, pred_price, lower_bound, upper_bound, change, change_percent in zip(
+                    date_strs, pred_prices.tolist(), lower_bounds.tolist(),
+                    upper_bounds.tolist(), changes.tolist(), change_percents.tolist()
+                )
+            ]
             
             # Calculate model accuracy metrics
             accuracy_metrics = self._calculate_accuracy_metrics(prices)
@@ -97,139 +264,90 @@ class PredictionService:
             logger.error(f"Error predicting prices for {symbol}: {str(e)}")
             raise Exception(f"Prediction failed for {symbol}: {str(e)}")
     
-    async def _predict_with_autoregression(self, prices, days):
+    async def _cached_fit(self, symbol, prices, model_name, fit_fn):
+        """Return a fitted model from the TTL cache, fitting in the pool on a miss"""
+        # Cheap O(1) fingerprint: the series length and last close change
+        # whenever new history arrives for the symbol
+        key = (symbol, model_name, len(prices), float(prices[-1]))
+        with _fit_cache_lock:
+            fitted_model = _fit_cache.get(key)
+
+        if fitted_model is None:
+            # A contiguous array pickles to the worker as one memcpy; the
+            # history cache already hands out contiguous float32, so this is
+            # normally a no-op (statsmodels upcasts internally where it must)
+            prices_arr = np.ascontiguousarray(prices)
+            loop = asyncio.get_event_loop()
+            fitted_model = await loop.run_in_executor(_fit_pool, fit_fn, prices_arr)
+            with _fit_cache_lock:
+                _fit_cache[key] = fitted_model
+
+        return fitted_model
+
+    async def _predict_with_autoregression(self, symbol, prices, days):
         """Predict using AutoRegression model"""
         try:
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, self._ar_predict, prices, days)
+            fitted_model = await self._cached_fit(symbol, prices, 'ar', _fit_ar)
+            forecast = fitted_model.forecast(steps=days)
+            return np.asarray(forecast)
         except Exception as e:
             logger.warning(f"AutoRegression failed: {e}")
             return self._simple_trend_prediction(prices, days)
-    
-    def _ar_predict(self, prices, days):
-        """Synchronous AutoRegression prediction"""
-        try:
-            # Determine optimal lag
-            max_lag = min(20, len(prices) // 5)
-            model = AutoReg(prices, lags=max_lag, trend='ct')
-            fitted_model = model.fit()
-            
-            # Forecast
-            forecast = fitted_model.forecast(steps=days)
-            return forecast.tolist()
-        except:
-            return self._simple_trend_prediction(prices, days)
-    
-    async def _predict_with_linear_regression(self, prices, days):
+
+    async def _predict_with_linear_regression(self, symbol, prices, days):
         """Predict using Linear Regression on features"""
         try:
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, self._lr_predict, prices, days)
+            coef, intercept = await self._cached_fit(symbol, prices, 'lr', _fit_lr)
+
+            # Predict future values as a scalar recurrence on the fitted
+            # coefficients - no per-step estimator dispatch
+            prices_arr = np.asarray(prices, dtype=np.float64)
+            return _lr_forecast(coef, intercept, prices_arr[-20:], len(prices_arr), days)
         except Exception as e:
             logger.warning(f"Linear Regression failed: {e}")
             return self._simple_trend_prediction(prices, days)
-    
-    def _lr_predict(self, prices, days):
-        """Synchronous Linear Regression prediction"""
-        try:
-            # Create features: moving averages, trends
-            df = pd.DataFrame({'price': prices})
-            df['ma_5'] = df['price'].rolling(5).mean()
-            df['ma_10'] = df['price'].rolling(10).mean()
-            df['ma_20'] = df['price'].rolling(20).mean()
-            df['trend'] = range(len(prices))
-            
-            # Remove NaN values
-            df = df.dropna()
-            
-            # Prepare features and target
-            features = ['ma_5', 'ma_10', 'ma_20', 'trend']
-            X = df[features].values
-            y = df['price'].values
-            
-            # Train model
-            model = LinearRegression()
-            model.fit(X, y)
-            
-            # Predict future values
-            predictions = []
-            last_prices = prices[-20:].tolist()  # Keep last 20 prices for moving averages
-            
-            for i in range(days):
-                # Calculate moving averages for prediction
-                ma_5 = np.mean(last_prices[-5:])
-                ma_10 = np.mean(last_prices[-10:])
-                ma_20 = np.mean(last_prices[-20:])
-                trend = len(prices) + i
-                
-                # Predict
-                X_pred = np.array([[ma_5, ma_10, ma_20, trend]])
-                pred = model.predict(X_pred)[0]
-                predictions.append(pred)
-                
-                # Update last_prices for next iteration
-                last_prices.append(pred)
-                if len(last_prices) > 20:
-                    last_prices.pop(0)
-            
-            return predictions
-        except:
-            return self._simple_trend_prediction(prices, days)
-    
-    async def _predict_with_arima(self, prices, days):
+
+    async def _predict_with_arima(self, symbol, prices, days):
         """Predict using ARIMA model"""
         try:
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, self._arima_predict, prices, days)
+            fitted_model = await self._cached_fit(symbol, prices, 'arima', _fit_arima)
+            forecast = fitted_model.forecast(steps=days)
+            return np.asarray(forecast)
         except Exception as e:
             logger.warning(f"ARIMA failed: {e}")
             return self._simple_trend_prediction(prices, days)
     
-    def _arima_predict(self, prices, days):
-        """Synchronous ARIMA prediction"""
-        try:
-            # Simple ARIMA(1,1,1) model
-            model = ARIMA(prices, order=(1, 1, 1))
-            fitted_model = model.fit()
-            forecast = fitted_model.forecast(steps=days)
-            return forecast.tolist()
-        except:
-            return self._simple_trend_prediction(prices, days)
-    
     def _simple_trend_prediction(self, prices, days):
         """Fallback simple trend prediction"""
-        # Calculate recent trend
-        recent_prices = prices[-10:]
-        trend = (recent_prices[-1] - recent_prices[0]) / len(recent_prices)
-        
-        predictions = []
-        for i in range(1, days + 1):
-            pred = prices[-1] + (trend * i)
-            predictions.append(pred)
-        
-        return predictions
-    
-    def _calculate_confidence_intervals(self, historical_prices, predictions):
-        """Calculate confidence intervals for predictions"""
-        # Calculate historical volatility
-        returns = np.diff(historical_prices) / historical_prices[:-1]
-        volatility = np.std(returns)
-        
-        confidence_intervals = []
-        for i, pred in enumerate(predictions):
-            # Increasing uncertainty over time
-            uncertainty = volatility * np.sqrt(i + 1) * pred * 0.1  # Scale factor
-            lower_bound = pred - (1.96 * uncertainty)  # 95% confidence
-            upper_bound = pred + (1.96 * uncertainty)
-            confidence_intervals.append([lower_bound, upper_bound])
-        
-        return confidence_intervals
+        # Project the average daily move of the last 10 sessions forward
+        trend = (prices[-1] - prices[-10]) / 10
+        return prices[-1] + trend * np.arange(1, days + 1)
     
+    async def predict_batch(self, symbols, days=30):
+        """Predict prices for several symbols concurrently"""
+        # Each symbol shares the history cache, fit cache and fit pool, so a
+        # dashboard-sized batch overlaps its downloads and model fits instead
+        # of paying them serially per request
+        outcomes = await asyncio.gather(
+            *(self.predict_prices(symbol, days) for symbol in symbols),
+            return_exceptions=True
+        )
+
+        results = {}
+        errors = {}
+        for symbol, outcome in zip(symbols, outcomes):
+            if isinstance(outcome, Exception):
+                errors[symbol] = str(outcome)
+            else:
+                results[symbol] = outcome
+
+        return results, errors
+
     def _calculate_accuracy_metrics(self, prices):
         """Calculate basic accuracy metrics"""
-        # Calculate some basic metrics
-        recent_volatility = np.std(prices[-30:]) / np.mean(prices[-30:]) * 100
+        # Calculate some basic metrics over a single 30-day view
+        recent = prices[-30:]
+        recent_volatility = recent.std() / recent.mean() * 100
         trend_direction = "upward" if prices[-1] > prices[-30] else "downward"
         
         return AccuracyMetrics(
@@ -239,14 +357,5 @@ class PredictionService:
         )
     
     def _generate_business_dates(self, start_date, days):
-        """Generate business days (excluding weekends)"""
-        business_dates = []
-        current_date = start_date + timedelta(days=1)
-        
-        while len(business_dates) < days:
-            # Skip weekends (5=Saturday, 6=Sunday)
-            if current_date.weekday() < 5:
-                business_dates.append(current_date)
-            current_date += timedelta(days=1)
-        
-        return business_dates
\ No newline at end of file
+        """Generate business days (excluding weekends) as a DatetimeIndex"""
+        return pd.bdate_range(start=start_date + pd.Timedelta(days=1), periods=days)
\ No newline at end of file